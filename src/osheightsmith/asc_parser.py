@@ -1,12 +1,19 @@
 """Parser for ESRI ASCII Grid (.asc) files."""
 
+import io
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import BinaryIO
+from pathlib import Path
+from typing import BinaryIO, Optional
 
 import numpy as np
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ASCHeader:
     """Header information from an ESRI ASCII Grid file."""
 
@@ -28,12 +35,48 @@ class ASCHeader:
         return self.yllcorner + self.cellsize / 2
 
 
-def parse_asc_file(file_obj: BinaryIO) -> tuple[ASCHeader, np.ndarray]:
+# Header keys, matched against the lowercased raw key bytes
+_HEADER_KEYS = {
+    key.encode("ascii"): key
+    for key in (
+        "ncols",
+        "nrows",
+        "xllcorner",
+        "yllcorner",
+        "xllcenter",
+        "yllcenter",
+        "cellsize",
+        "nodata_value",
+    )
+}
+_INT_HEADER_KEYS = frozenset({"ncols", "nrows"})
+
+# A header line at the start of an ESRI ASCII Grid: a known key followed by a number
+_ASC_SIGNATURE_RE = re.compile(
+    rb"\s*(?:" + b"|".join(_HEADER_KEYS) + rb")[ \t]+[-+.\d]", re.IGNORECASE
+)
+
+# Most recently parsed files by absolute path, with the (st_mtime_ns, st_size, expected
+# header) they were parsed with; the least recently used is evicted beyond the maximum
+_ASC_CACHE: OrderedDict[str, tuple[tuple[int, int, Optional[ASCHeader]], ASCHeader, np.ndarray]] = (
+    OrderedDict()
+)
+_ASC_CACHE_MAXSIZE = 64
+# Guards _ASC_CACHE, which tiles loaded from a thread pool share
+_ASC_CACHE_LOCK = threading.Lock()
+
+
+def parse_asc_file(
+    file_obj: BinaryIO | str | Path, expected: Optional[ASCHeader] = None
+) -> tuple[ASCHeader, np.ndarray]:
     """
     Parse an ESRI ASCII Grid file.
 
     Args:
-        file_obj: File object opened in binary mode
+        file_obj: Seekable file object opened in binary mode, or a path to an .asc file
+        expected: Header known in advance, e.g. for a fixed-layout product. The
+                  file's header lines are then skipped without being parsed and
+                  this header is returned; only the data count is checked.
 
     Returns:
         Tuple of (header, data_array)
@@ -42,15 +85,65 @@ def parse_asc_file(file_obj: BinaryIO) -> tuple[ASCHeader, np.ndarray]:
     Raises:
         ValueError: If file format is invalid
     """
-    # Read the file as text
-    content = file_obj.read().decode("utf-8")
-    lines = content.strip().split("\n")
+    if isinstance(file_obj, (str, Path)):
+        return _parse_asc_path(Path(file_obj), expected)
+
+    if expected is not None:
+        _skip_header(file_obj)
+        return expected, _read_data(file_obj, expected)
+
+    header = _read_header(file_obj)
+    return header, _read_data(file_obj, header)
+
+
+def _skip_header(file_obj: BinaryIO) -> None:
+    """
+    Advance past the header lines, leaving the file at the first data line.
+
+    Header lines are recognised by starting with a letter; data lines start
+    with a digit, sign or decimal point.
+
+    Args:
+        file_obj: Seekable file object positioned at the start of the file
+
+    Raises:
+        ValueError: If the file has no data section
+    """
+    while True:
+        data_start = file_obj.tell()
+        line = file_obj.readline()
+        if not line:
+            raise ValueError("No data found in ASC file")
+
+        line = line.lstrip()
+        if line and not line[:1].isalpha():
+            break
+
+    file_obj.seek(data_start)
+
+
+def _read_header(file_obj: BinaryIO) -> ASCHeader:
+    """
+    Read and validate the header, leaving the file at the first data line.
+
+    Args:
+        file_obj: Seekable file object positioned at the start of the file
+
+    Returns:
+        Parsed header
 
-    # Parse header
+    Raises:
+        ValueError: If the header is invalid or there is no data section
+    """
+    # Parse header line by line; only the short header lines are decoded
     header_data = {}
-    data_start_line = 0
 
-    for i, line in enumerate(lines):
+    while True:
+        data_start = file_obj.tell()
+        line = file_obj.readline()
+        if not line:
+            raise ValueError("No data found in ASC file")
+
         line = line.strip()
         if not line:
             continue
@@ -58,24 +151,17 @@ def parse_asc_file(file_obj: BinaryIO) -> tuple[ASCHeader, np.ndarray]:
         parts = line.split(None, 1)
         if len(parts) != 2:
             # Assume we've reached the data section
-            data_start_line = i
             break
 
-        key = parts[0].lower()
-        value = parts[1]
-
-        if key in ["ncols", "nrows"]:
-            header_data[key] = int(value)
-        elif key in ["xllcorner", "yllcorner", "xllcenter", "yllcenter", "cellsize"]:
-            header_data[key] = float(value)
-        elif key == "nodata_value":
-            header_data["nodata_value"] = float(value)
-        else:
+        key = _HEADER_KEYS.get(parts[0].lower())
+        if key is None:
             # Unknown header field, assume data starts here
-            data_start_line = i
             break
-    else:
-        raise ValueError("No data found in ASC file")
+
+        header_data[key] = int(parts[1]) if key in _INT_HEADER_KEYS else float(parts[1])
+
+    # Rewind to the start of the first data line
+    file_obj.seek(data_start)
 
     # Validate required header fields
     required = ["ncols", "nrows", "cellsize"]
@@ -102,21 +188,128 @@ def parse_asc_file(file_obj: BinaryIO) -> tuple[ASCHeader, np.ndarray]:
         nodata_value=header_data.get("nodata_value", -9999.0),
     )
 
-    # Parse data
-    data_lines = lines[data_start_line:]
-    data_str = " ".join(data_lines)
-    values = [float(v) for v in data_str.split()]
+    return header
+
+
+def _read_data(file_obj: BinaryIO, header: ASCHeader) -> np.ndarray:
+    """
+    Read the data section into an array shaped by the header.
+
+    Args:
+        file_obj: File object positioned at the first data line
+        header: Header giving the grid dimensions
+
+    Returns:
+        Array of shape (nrows, ncols)
+
+    Raises:
+        ValueError: If a value is invalid or the value count does not match
+    """
+    # Parse data with numpy's C row reader, which is fastest for the usual one row per line;
+    # it reads the bytes through a BytesIO view rather than a list of per-line copies
+    body = file_obj.read()
+    try:
+        values = np.loadtxt(io.BytesIO(body), dtype=np.float32, comments=None, ndmin=2)
+    except ValueError:
+        # Rows wrapped over several lines, or a bad value; a flat token scan handles the
+        # former and reports the latter
+        try:
+            values = np.fromstring(body, dtype=np.float32, sep=" ")
+        except ValueError as e:
+            raise ValueError(f"Invalid data value in ASC file: {e}") from e
 
     expected_count = header.ncols * header.nrows
-    if len(values) != expected_count:
-        raise ValueError(f"Data count mismatch: expected {expected_count}, got {len(values)}")
+    if values.size != expected_count:
+        raise ValueError(f"Data count mismatch: expected {expected_count}, got {values.size}")
 
     # Reshape into array (row 1 is at top)
-    data = np.array(values, dtype=np.float32).reshape((header.nrows, header.ncols))
+    return values.reshape((header.nrows, header.ncols))
+
+
+def sniff_asc(buf: bytes, max_read_length: int = 500) -> bool:
+    """
+    Check whether bytes look like the start of an ESRI ASCII Grid file.
+
+    Only the first max_read_length bytes are examined, so this is a cheap
+    test before committing to a full parse.
+
+    Args:
+        buf: Leading bytes of the file
+        max_read_length: Maximum number of bytes to examine
+
+    Returns:
+        True if the bytes start with an ASC header line
+    """
+    return _ASC_SIGNATURE_RE.match(buf, 0, max_read_length) is not None
+
+
+def clear_asc_cache() -> None:
+    """Forget all ASC files parsed by path."""
+    with _ASC_CACHE_LOCK:
+        _ASC_CACHE.clear()
+
+
+def _parse_asc_path(path: Path, expected: Optional[ASCHeader]) -> tuple[ASCHeader, np.ndarray]:
+    """
+    Parse an ASC file on disk, reusing the previous result if the file is unchanged.
+
+    A file whose modification time or size has changed since it was parsed is
+    read again. Up to _ASC_CACHE_MAXSIZE files are kept, and the least recently
+    used is evicted first. The returned data array is read-only, as it is shared
+    between callers.
+
+    Args:
+        path: Path to the .asc file
+        expected: Header known in advance, see parse_asc_file
+
+    Returns:
+        Tuple of (header, data_array)
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+    fingerprint = (stat.st_mtime_ns, stat.st_size, expected)
 
+    with _ASC_CACHE_LOCK:
+        cached = _ASC_CACHE.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            _ASC_CACHE.move_to_end(key)
+            return cached[1], cached[2]
+
+    # Parsed outside the lock so other files can be read meanwhile; failed parses
+    # raise before reaching the cache
+    header, data = _read_asc_path(key, expected)
+    data.setflags(write=False)
+    with _ASC_CACHE_LOCK:
+        _ASC_CACHE[key] = (fingerprint, header, data)
+        _ASC_CACHE.move_to_end(key)
+        while len(_ASC_CACHE) > _ASC_CACHE_MAXSIZE:
+            _ASC_CACHE.popitem(last=False)
     return header, data
 
 
+def _read_asc_path(path: str, expected: Optional[ASCHeader]) -> tuple[ASCHeader, np.ndarray]:
+    """
+    Parse an ASC file on disk, reading it through a memory map where possible.
+
+    Args:
+        path: Path to the .asc file
+        expected: Header known in advance, see parse_asc_file
+
+    Returns:
+        Tuple of (header, data_array)
+    """
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty files and some filesystems cannot be mapped; use buffered reads
+            return parse_asc_file(f, expected)
+
+        # mmap supports readline/seek/read directly, skipping the buffered I/O layer
+        with mapped:
+            return parse_asc_file(mapped, expected)
+
+
 def load_asc_from_zip(zip_file, asc_path: str) -> tuple[ASCHeader, np.ndarray]:
     """
     Load an ASC file from within a zip archive.
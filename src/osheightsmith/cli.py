@@ -4,9 +4,29 @@ from typing import Optional
 
 import typer
 from rich.console import Console
-from rich.table import Table
 
-from .heightmap import HeightmapGenerator
+from .defaults import DEFAULT_PNG_COMPRESS_LEVEL
+
+# HeightmapGenerator and DEFAULT_CACHE_DIR are imported on first use (see __getattr__),
+# so commands that never generate a heightmap do not load numpy
+_LAZY_HEIGHTMAP_NAMES = ("HeightmapGenerator", "DEFAULT_CACHE_DIR")
+
+
+def __getattr__(name: str):
+    """Import heightmap names on first access and keep them as module globals."""
+    if name in _LAZY_HEIGHTMAP_NAMES:
+        from . import heightmap
+
+        value = getattr(heightmap, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _heightmap_name(name: str):
+    """Look up a lazily imported heightmap name, honouring any already set global."""
+    return globals()[name] if name in globals() else __getattr__(name)
+
 
 app = typer.Typer(
     name="osheightsmith",
@@ -59,6 +79,26 @@ def generate(
         "-i",
         help="Interpolation method for missing tiles (none, nearest, linear, cubic)",
     ),
+    cache: bool = typer.Option(
+        True,
+        "--cache/--no-cache",
+        help="Cache parsed tiles and heightmaps between runs",
+    ),
+    compress_level: int = typer.Option(
+        DEFAULT_PNG_COMPRESS_LEVEL,
+        "--compress-level",
+        "-c",
+        help="PNG zlib compression level, 0 (fastest) to 9 (smallest)",
+        min=0,
+        max=9,
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        help="Number of threads used to load tiles (default: min(32, CPU count + 4))",
+        min=1,
+    ),
 ) -> None:
     """
     Generate a square PNG heightmap from OS Terrain 50 data.
@@ -80,22 +120,30 @@ def generate(
 
         # Create generator
         console.print(f"Loading terrain data from [cyan]{zip_path}[/cyan]...")
-        generator = HeightmapGenerator(zip_path)
+        generator_class = _heightmap_name("HeightmapGenerator")
+        cache_dir = _heightmap_name("DEFAULT_CACHE_DIR") if cache else None
+        generator = generator_class(zip_path, cache_dir=cache_dir, max_workers=workers)
 
         # Generate heightmap
         console.print(
             f"Generating heightmap for [cyan]{grid_ref}[/cyan] ([cyan]{size}km[/cyan] area)..."
         )
-        output_path, width, height = generator.generate_heightmap(
-            grid_ref=grid_ref,
-            size_km=size,
-            output_path=output,
-            bit_depth=bit_depth,
-            fill_missing=fill_missing,
-            interpolation=interpolation,
-        )
+        try:
+            output_path, width, height = generator.generate_heightmap(
+                grid_ref=grid_ref,
+                size_km=size,
+                output_path=output,
+                bit_depth=bit_depth,
+                fill_missing=fill_missing,
+                interpolation=interpolation,
+                compress_level=compress_level,
+            )
+        finally:
+            generator.close()
 
         # Display results
+        from rich.table import Table
+
         console.print("\n[green]✓[/green] Heightmap generated successfully!\n")
 
         table = Table(show_header=False, box=None)
@@ -139,13 +187,15 @@ def info(
     Display information about a grid reference without generating a heightmap.
     """
     try:
-        from .grid_reference import get_tiles_for_area, parse_grid_reference
+        from rich.table import Table
+
+        from .grid_reference import get_tiles_for_grid_ref, parse_grid_reference
 
         # Parse grid reference
         easting, northing, precision = parse_grid_reference(grid_ref)
 
         # Get required tiles
-        tiles = get_tiles_for_area(easting, northing, size)
+        tiles = get_tiles_for_grid_ref(grid_ref, size)
 
         # Display information
         console.print("\n[cyan]Grid Reference Information[/cyan]\n")
@@ -0,0 +1,8 @@
+"""Defaults shared by the heightmap generator and the CLI.
+
+Kept free of numpy and Pillow so the CLI can import it without loading them.
+"""
+
+# Default zlib level for PNG output: level 1 writes heightmaps about 4x faster than
+# Pillow's default of 6, for files a few percent larger
+DEFAULT_PNG_COMPRESS_LEVEL = 1
@@ -1,7 +1,9 @@
 """UK Ordnance Survey grid reference parsing and conversion."""
 
 import re
-from typing import Tuple
+import sys
+from functools import lru_cache
+from typing import Optional, Tuple
 
 
 # UK National Grid 100km square letter codes
@@ -89,6 +91,40 @@ GRID_SQUARES = {
 }
 
 
+def _build_square_codes() -> tuple[tuple[Optional[str], ...], ...]:
+    """Build the [square_e][square_n] -> lowercase square code table."""
+    width = max(e for e, _ in GRID_SQUARES.values()) + 1
+    height = max(n for _, n in GRID_SQUARES.values()) + 1
+    columns = [[None] * height for _ in range(width)]
+    for code, (e, n) in GRID_SQUARES.items():
+        columns[e][n] = code.lower()
+    return tuple(tuple(column) for column in columns)
+
+
+# Reverse lookup: _SQUARE_CODES[square_e][square_n] -> lowercase square code, or None
+# where the grid has no square
+_SQUARE_CODES = _build_square_codes()
+
+# Tile lookup: _TILE_NAMES[easting // 10000][northing // 10000] -> interned tile name,
+# or None outside the grid
+_TILE_NAMES = tuple(
+    tuple(
+        sys.intern(f"{code}{tile_e}{tile_n}") if code else None
+        for code in column
+        for tile_n in range(10)
+    )
+    for column in _SQUARE_CODES
+    for tile_e in range(10)
+)
+
+# Tile name: 2 letters + 2 digits, e.g. "st17"
+_TILE_NAME_RE = re.compile(r"^([a-z]{2})(\d)(\d)$")
+
+# Resolution in meters by number of digits per coordinate
+_PRECISION = {1: 10000, 2: 1000, 3: 100, 4: 10, 5: 1}
+
+
+@lru_cache(maxsize=4096)
 def parse_grid_reference(grid_ref: str) -> Tuple[int, int, int]:
     """
     Parse a UK grid reference into easting, northing coordinates.
@@ -106,13 +142,18 @@ def parse_grid_reference(grid_ref: str) -> Tuple[int, int, int]:
     # Remove spaces and convert to uppercase
     grid_ref = grid_ref.replace(" ", "").upper()
 
-    # Match pattern: 2 letters followed by even number of digits
-    match = re.match(r"^([A-Z]{2})(\d+)$", grid_ref)
-    if not match:
+    # Match pattern: 2 ASCII letters followed by at least one digit; isdecimal()
+    # accepts the same digits as \d, including non-ASCII ones that int() parses
+    square, digits = grid_ref[:2], grid_ref[2:]
+    if not (
+        len(square) == 2
+        and square.isascii()
+        and square.isalpha()
+        and square.isupper()
+        and digits.isdecimal()
+    ):
         raise ValueError(f"Invalid grid reference format: {grid_ref}")
 
-    square, digits = match.groups()
-
     # Check if square code is valid
     if square not in GRID_SQUARES:
         raise ValueError(f"Invalid grid square code: {square}")
@@ -130,7 +171,7 @@ def parse_grid_reference(grid_ref: str) -> Tuple[int, int, int]:
     square_e, square_n = GRID_SQUARES[square]
 
     # Calculate precision (resolution)
-    precision = 10 ** (5 - half)  # 5 digits = 1m, 4 = 10m, 3 = 100m, etc.
+    precision = _PRECISION.get(half) or 10 ** (5 - half)  # 5 digits = 1m, 4 = 10m, etc.
 
     # Calculate full coordinates
     easting = square_e * 100000 + int(easting_digits) * precision
@@ -152,25 +193,17 @@ def get_tile_name(easting: int, northing: int) -> str:
     Returns:
         Tile name like "st17"
     """
-    # Find 100km square
-    square_e = easting // 100000
-    square_n = northing // 100000
-
-    # Find the square code
-    square_code = None
-    for code, (e, n) in GRID_SQUARES.items():
-        if e == square_e and n == square_n:
-            square_code = code.lower()
-            break
-
-    if not square_code:
+    # Index the 10km tile table directly
+    tile_e = easting // 10000
+    tile_n = northing // 10000
+
+    tile_name = None
+    if 0 <= tile_e < len(_TILE_NAMES) and 0 <= tile_n < len(_TILE_NAMES[0]):
+        tile_name = _TILE_NAMES[tile_e][tile_n]
+    if tile_name is None:
         raise ValueError(f"Coordinates outside valid grid: {easting}, {northing}")
 
-    # Calculate 10km tile within the 100km square
-    tile_e = (easting % 100000) // 10000
-    tile_n = (northing % 100000) // 10000
-
-    return f"{square_code}{tile_e}{tile_n}"
+    return tile_name
 
 
 def get_tile_corner(tile_name: str) -> Tuple[int, int]:
@@ -187,7 +220,7 @@ def get_tile_corner(tile_name: str) -> Tuple[int, int]:
         ValueError: If tile name format is invalid
     """
     # Parse tile name: 2 letters + 2 digits
-    match = re.match(r"^([a-z]{2})(\d)(\d)$", tile_name.lower())
+    match = _TILE_NAME_RE.match(tile_name.lower())
     if not match:
         raise ValueError(f"Invalid tile name format: {tile_name}")
 
@@ -232,21 +265,35 @@ def get_tiles_for_area(center_e: int, center_n: int, size_km: int) -> list[str]:
     min_n = center_n - half_size
     max_n = center_n + half_size
 
-    # Get all tiles that intersect this area
-    tiles = set()
+    # Tile index range covering the bounds, clipped to the grid (10km tiles)
+    start_e = max(min_e // 10000, 0)
+    end_e = min(max(max_e // 10000 + 1, 0), len(_TILE_NAMES))
+    start_n = max(min_n // 10000, 0)
+    end_n = min(max(max_n // 10000 + 1, 0), len(_TILE_NAMES[0]))
+
+    # Slice the tile table; None marks tiles outside the valid grid
+    tiles = [
+        name for column in _TILE_NAMES[start_e:end_e] for name in column[start_n:end_n] if name
+    ]
+
+    tiles.sort()
+    return tiles
+
+
+@lru_cache(maxsize=1024)
+def get_tiles_for_grid_ref(grid_ref: str, size_km: int) -> tuple[str, ...]:
+    """
+    Get the tile names needed to cover an area centred on a grid reference.
 
-    # Round to tile boundaries (10km)
-    start_e = (min_e // 10000) * 10000
-    end_e = ((max_e // 10000) + 1) * 10000
-    start_n = (min_n // 10000) * 10000
-    end_n = ((max_n // 10000) + 1) * 10000
+    Args:
+        grid_ref: Grid reference like "ST1876"
+        size_km: Size of square area in kilometers
 
-    for e in range(start_e, end_e, 10000):
-        for n in range(start_n, end_n, 10000):
-            try:
-                tiles.add(get_tile_name(e, n))
-            except ValueError:
-                # Skip tiles outside valid grid
-                continue
+    Returns:
+        Sorted tuple of tile names needed to cover the area
 
-    return sorted(list(tiles))
+    Raises:
+        ValueError: If grid reference format is invalid
+    """
+    easting, northing, _ = parse_grid_reference(grid_ref)
+    return tuple(get_tiles_for_area(easting, northing, size_km))
@@ -1,32 +1,325 @@
 """Heightmap generation from OS Terrain 50 data."""
 
+import dataclasses
+import io
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import threading
 import zipfile
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Literal, Optional
+from typing import BinaryIO, Literal, Optional
 
 import numpy as np
-from PIL import Image
-from scipy.interpolate import griddata
 
-from .asc_parser import ASCHeader, load_asc_from_zip
-from .grid_reference import get_tiles_for_area, parse_grid_reference
+from .asc_parser import ASCHeader, parse_asc_file, sniff_asc
+from .defaults import DEFAULT_PNG_COMPRESS_LEVEL
+from .grid_reference import get_tiles_for_grid_ref, parse_grid_reference
+
+# Tile zips inside the main archive: data/{grid_square}/{tile}_OST50GRID_{date}.zip
+_TILE_ZIP_RE = re.compile(r"^data/([a-z]{2})/(\1\d\d)_OST50GRID_[^/]*\.zip$")
+
+# Sentinel for cells without data; every tile's own nodata_value is mapped to it on load
+NODATA_VALUE = -9999.0
+
+# Marker for placeholder cells to be filled by interpolation, distinct from NODATA
+INTERPOLATION_MARKER = -9998.0
+
+
+def _default_cache_dir() -> Path:
+    """Cache directory under $XDG_CACHE_HOME, or ~/.cache when it is unset or invalid."""
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    # The XDG spec requires relative paths to be ignored, like empty ones
+    if not cache_home or not os.path.isabs(cache_home):
+        cache_home = "~/.cache"
+    return Path(cache_home).expanduser() / "osheightsmith"
+
+
+# Default location for cached parsed tiles
+DEFAULT_CACHE_DIR = _default_cache_dir()
+
+# Version of the cached tiles and heightmaps, part of the cache directory name. Bump it
+# whenever parsing, stitching or interpolation changes what gets cached, so entries
+# written by older code are not reused.
+_CACHE_VERSION = 2
+
+# Default threads used to load tiles concurrently, the same as ThreadPoolExecutor's
+# own default
+_DEFAULT_LOAD_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# Width in cells of the band of valid data around each hole used to interpolate it
+_INTERPOLATION_BAND = 8
+
+# Cells normalised per block: 1 MB of float32, small enough to stay in cache
+_NORMALISE_BLOCK_CELLS = 1 << 18
+
+# Leading bytes of a tile's .asc entry checked before parsing it
+_ASC_SNIFF_LENGTH = 500
+
+# Zip local file header: fixed 30 bytes, name/extra lengths at offset 26
+_LOCAL_HEADER_SIZE = 30
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+
+def _temp_suffix() -> str:
+    """Suffix for a temporary file unique to this process and thread."""
+    return f".{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _save_npy_atomic(path: Path, data: np.ndarray) -> None:
+    """Save an array as .npy under a temporary name, then rename it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + _temp_suffix())
+    with open(tmp_path, "wb") as f:
+        np.save(f, data)
+    os.replace(tmp_path, path)
+
+
+@lru_cache(maxsize=4)
+def _open_terrain_archive(
+    path: str, mtime_ns: int, size: int
+) -> tuple[Optional[mmap.mmap], zipfile.ZipFile, dict[str, str]]:
+    """
+    Open a terrain zip and index its tile zips by tile name.
+
+    The file is memory-mapped where possible so reads are served from the
+    page cache. Results are cached by path, modification time and size, so
+    an archive that changes on disk is opened afresh.
+
+    Args:
+        path: Absolute path to the terrain zip
+        mtime_ns: Modification time of the file, part of the cache key
+        size: Size of the file in bytes, part of the cache key
+
+    Returns:
+        Tuple of (mapping or None, open ZipFile, tile name -> tile zip path)
+    """
+    mapped = None
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        main_zip = zipfile.ZipFile(mapped, "r")
+    except (OSError, ValueError):
+        # Empty files and some filesystems cannot be mapped
+        mapped = None
+        main_zip = zipfile.ZipFile(path, "r")
+
+    tile_index: dict[str, str] = {}
+    for name in main_zip.namelist():
+        match = _TILE_ZIP_RE.match(name)
+        if match:
+            tile_index.setdefault(match.group(2), name)
+
+    return mapped, main_zip, tile_index
+
+
+class _MappedSlice(io.RawIOBase):
+    """Read-only, seekable file object over a slice of a buffer, without copying it."""
+
+    def __init__(self, buffer, start: int, size: int):
+        self._view = memoryview(buffer)[start : start + size]
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._pos = offset
+        return self._pos
+
+    def readinto(self, b) -> int:
+        chunk = self._view[self._pos : self._pos + len(b)]
+        n = len(chunk)
+        b[:n] = chunk
+        self._pos += n
+        return n
+
+    def close(self) -> None:
+        # Release the view so the underlying mmap can be closed
+        self._view.release()
+        super().close()
+
+
+@dataclasses.dataclass
+class _TileSet:
+    """Tile headers stored as parallel arrays for vectorised bounds arithmetic."""
+
+    xllcorner: np.ndarray
+    yllcorner: np.ndarray
+    ncols: np.ndarray
+    nrows: np.ndarray
+    cellsize: float
+    data: list[np.ndarray]
+
+    @classmethod
+    def from_tile_data(cls, tile_data: dict[str, tuple[ASCHeader, np.ndarray]]) -> "_TileSet":
+        """Build a tile set from a dictionary of tile_name -> (header, data)."""
+        headers = [header for header, _ in tile_data.values()]
+        return cls(
+            xllcorner=np.array([h.xllcorner for h in headers], dtype=np.float64),
+            yllcorner=np.array([h.yllcorner for h in headers], dtype=np.float64),
+            ncols=np.array([h.ncols for h in headers], dtype=np.intp),
+            nrows=np.array([h.nrows for h in headers], dtype=np.intp),
+            cellsize=headers[0].cellsize,
+            # Tiles stored as float32 already are used as-is, without a copy
+            data=[np.asarray(data, dtype=np.float32) for _, data in tile_data.values()],
+        )
+
+
+@lru_cache(maxsize=4)
+def _placeholder_data(nrows: int, ncols: int, fill_value: float) -> np.ndarray:
+    """Read-only placeholder tile data, shared by every missing tile of this shape."""
+    data = np.full((nrows, ncols), fill_value, dtype=np.float32)
+    data.flags.writeable = False
+    return data
+
+
+def _plan_blits(tiles: _TileSet, left: int, top: int, right: int, bottom: int) -> np.ndarray:
+    """
+    Work out which part of each tile lands where in an output window.
+
+    The window and results are in whole cells of the tile grid, with rows
+    counting southwards from the top of the map (negated northings).
+
+    Args:
+        tiles: Tile headers as parallel arrays
+        left: First column of the window
+        top: First row of the window
+        right: Column just past the window
+        bottom: Row just past the window
+
+    Returns:
+        Array of shape (n, 7) with one row per tile overlapping the window:
+        (tile index, dst_row, dst_col, src_row, src_col, height, width)
+    """
+    cellsize = tiles.cellsize
+
+    # Tile positions in the window's cell grid
+    tile_left = np.rint(tiles.xllcorner / cellsize).astype(np.intp)
+    tile_top = -np.rint(tiles.yllcorner / cellsize).astype(np.intp) - tiles.nrows
+
+    # Overlap of every tile with the window
+    col_start = np.maximum(left, tile_left)
+    col_end = np.minimum(right, tile_left + tiles.ncols)
+    row_start = np.maximum(top, tile_top)
+    row_end = np.minimum(bottom, tile_top + tiles.nrows)
+    heights = row_end - row_start
+    widths = col_end - col_start
+
+    # Row/column offsets of each overlap in the window and in its tile
+    plan = np.column_stack(
+        [
+            np.arange(len(tile_left)),
+            row_start - top,
+            col_start - left,
+            row_start - tile_top,
+            col_start - tile_left,
+            heights,
+            widths,
+        ]
+    )
+    return plan[(heights > 0) & (widths > 0)]
 
 
 class HeightmapGenerator:
     """Generate PNG heightmaps from OS Terrain 50 data."""
 
-    def __init__(self, terrain_zip_path: str):
+    def __init__(
+        self,
+        terrain_zip_path: str,
+        cache_dir: Optional[str | Path] = None,
+        max_workers: Optional[int] = None,
+    ):
         """
         Initialize the generator.
 
         Args:
             terrain_zip_path: Path to the OS Terrain 50 zip file
+            cache_dir: Directory for caching parsed tiles as .npy files
+                       (default: no on-disk cache)
+            max_workers: Number of threads used to load tiles
+                         (default: one per tile, up to ThreadPoolExecutor's
+                         default of min(32, CPU count + 4))
         """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
         self.terrain_zip_path = Path(terrain_zip_path)
         if not self.terrain_zip_path.exists():
             raise FileNotFoundError(f"Terrain data not found: {terrain_zip_path}")
 
+        self.max_workers = max_workers
+
+        # Cached tiles are only valid for this exact version of the zip
+        self._tile_cache_dir: Optional[Path] = None
+        if cache_dir is not None:
+            stat = self.terrain_zip_path.stat()
+            self._tile_cache_dir = (
+                Path(cache_dir)
+                / f"{self.terrain_zip_path.stem}-{stat.st_size}-{stat.st_mtime_ns}"
+                / f"v{_CACHE_VERSION}"
+            )
+
+        # The main zip is opened on first use and kept open across tiles
+        self._lock = threading.Lock()
+        self._mapped: Optional[mmap.mmap] = None
+        self._main_zip: Optional[zipfile.ZipFile] = None
+        self._tile_index: dict[str, str] = {}
+        self._tile_cache: dict[str, tuple[ASCHeader, np.ndarray]] = {}
+
+    def __enter__(self) -> "HeightmapGenerator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the main zip and drop any cached tiles.
+
+        The open archive itself is shared between generators and stays open
+        for reuse; _open_terrain_archive.cache_clear() drops it.
+        """
+        self._main_zip = None
+        self._mapped = None
+        self._tile_index = {}
+        self._tile_cache.clear()
+
+    def _open_main_zip(self) -> zipfile.ZipFile:
+        """
+        Open the main zip and its index of tile zips.
+
+        The archive is shared with any other generator over the same unchanged
+        file, so the central directory is only read once per process.
+
+        Returns:
+            The open main ZipFile
+        """
+        with self._lock:
+            if self._main_zip is None:
+                stat = self.terrain_zip_path.stat()
+                self._mapped, self._main_zip, self._tile_index = _open_terrain_archive(
+                    str(self.terrain_zip_path.resolve()), stat.st_mtime_ns, stat.st_size
+                )
+            return self._main_zip
+
     def _load_tile(
         self, tile_name: str, fill_missing: bool = False, interpolate: bool = False
     ) -> Optional[tuple[ASCHeader, np.ndarray]]:
@@ -41,40 +334,179 @@ class HeightmapGenerator:
         Returns:
             Tuple of (header, data) or None if tile not found
         """
+        if tile_name in self._tile_cache:
+            return self._tile_cache[tile_name]
+
+        tile = self._read_cached_tile(tile_name)
+        if tile is not None:
+            self._tile_cache[tile_name] = tile
+            return tile
+
         # Tile structure: data/{grid_square}/{tile}_OST50GRID_20250529.zip
         # Inside that zip: {tile}_OST50GRID_20250529.asc
-        grid_square = tile_name[:2]
-
-        # Open the main zip
-        with zipfile.ZipFile(self.terrain_zip_path, "r") as main_zip:
-            # Look for the tile zip
-            tile_zip_pattern = f"data/{grid_square}/{tile_name}_OST50GRID_"
-
-            # Find matching tile zip
-            tile_zip_name = None
-            for name in main_zip.namelist():
-                if name.startswith(tile_zip_pattern) and name.endswith(".zip"):
-                    tile_zip_name = name
-                    break
-
-            if not tile_zip_name:
+        main_zip = self._open_main_zip()
+        tile_zip_name = self._tile_index.get(tile_name)
+
+        if not tile_zip_name:
+            if fill_missing:
+                return self._create_placeholder_tile(tile_name, interpolate=interpolate)
+            return None
+
+        with (
+            self._open_tile_zip(main_zip, tile_zip_name) as tile_zip_data,
+            zipfile.ZipFile(tile_zip_data, "r") as tile_zip,
+        ):
+            # Parse the first .asc file that has an ASC header; the sniffed bytes are
+            # peeked from the stream, so the parse does not read them again
+            tile = None
+            for asc_name in tile_zip.namelist():
+                if not asc_name.endswith(".asc"):
+                    continue
+                with tile_zip.open(asc_name) as asc_file:
+                    if sniff_asc(asc_file.peek(_ASC_SNIFF_LENGTH)):
+                        tile = self._canonicalise_nodata(*parse_asc_file(asc_file))
+                        break
+
+            if tile is None:
                 if fill_missing:
                     return self._create_placeholder_tile(tile_name, interpolate=interpolate)
                 return None
 
-            # Read the nested zip
-            with main_zip.open(tile_zip_name) as tile_zip_file:
-                tile_zip_data = BytesIO(tile_zip_file.read())
+        self._write_cached_tile(tile_name, tile)
+        self._tile_cache[tile_name] = tile
+        return tile
 
-                with zipfile.ZipFile(tile_zip_data, "r") as tile_zip:
-                    # Find the .asc file
-                    asc_files = [f for f in tile_zip.namelist() if f.endswith(".asc")]
-                    if not asc_files:
-                        if fill_missing:
-                            return self._create_placeholder_tile(tile_name, interpolate=interpolate)
-                        return None
+    def _canonicalise_nodata(
+        self, header: ASCHeader, data: np.ndarray
+    ) -> tuple[ASCHeader, np.ndarray]:
+        """
+        Map a tile's own NODATA value onto NODATA_VALUE.
+
+        Stitching, interpolation and normalisation all compare against the
+        single NODATA_VALUE sentinel, so tiles declaring a different
+        nodata_value are rewritten once here rather than on every pass.
+
+        Args:
+            header: Parsed tile header
+            data: Parsed tile data
+
+        Returns:
+            Tuple of (header, data) using NODATA_VALUE
+        """
+        if header.nodata_value == NODATA_VALUE:
+            return header, data
+
+        data = np.where(data == header.nodata_value, np.float32(NODATA_VALUE), data)
+        return dataclasses.replace(header, nodata_value=NODATA_VALUE), data
+
+    def _read_cached_tile(self, tile_name: str) -> Optional[tuple[ASCHeader, np.ndarray]]:
+        """
+        Read a previously parsed tile from the on-disk cache.
+
+        The data is memory-mapped read-only, so only the pages that are used
+        get read.
+
+        Args:
+            tile_name: Tile name like "st17"
+
+        Returns:
+            Tuple of (header, data) or None if the tile is not cached
+        """
+        if self._tile_cache_dir is None:
+            return None
+
+        header_path = self._tile_cache_dir / f"{tile_name}.json"
+        data_path = self._tile_cache_dir / f"{tile_name}.npy"
+        try:
+            header = ASCHeader(**json.loads(header_path.read_text()))
+            data = np.load(data_path, mmap_mode="r")
+        except (OSError, ValueError, TypeError):
+            return None
+
+        return header, data
+
+    def _write_cached_tile(self, tile_name: str, tile: tuple[ASCHeader, np.ndarray]) -> None:
+        """
+        Write a parsed tile to the on-disk cache.
+
+        Files are written under temporary names and renamed into place so a
+        concurrent reader never sees a partial file. Failures are ignored, as
+        the cache is only an optimisation.
+
+        Args:
+            tile_name: Tile name like "st17"
+            tile: Tuple of (header, data)
+        """
+        if self._tile_cache_dir is None:
+            return
+
+        header, data = tile
+        header_path = self._tile_cache_dir / f"{tile_name}.json"
+        data_path = self._tile_cache_dir / f"{tile_name}.npy"
+        try:
+            # The header is written last; its presence marks a complete entry
+            _save_npy_atomic(data_path, data)
+
+            tmp_header_path = header_path.with_name(header_path.name + _temp_suffix())
+            tmp_header_path.write_text(json.dumps(dataclasses.asdict(header)))
+            os.replace(tmp_header_path, header_path)
+        except OSError:
+            pass
+
+    def _heightmap_cache_path(
+        self, center_e: int, center_n: int, size_km: int, fill_missing: bool, interpolation: str
+    ) -> Optional[Path]:
+        """
+        Get the on-disk cache path for a stitched heightmap, before normalisation.
 
-                    return load_asc_from_zip(tile_zip, asc_files[0])
+        The bit depth is not part of the key, as it only affects encoding.
+
+        Args:
+            center_e: Center easting in meters
+            center_n: Center northing in meters
+            size_km: Size of the area in kilometers
+            fill_missing: Whether missing tiles are filled with placeholders
+            interpolation: Interpolation method for missing tiles
+
+        Returns:
+            Path to the cached .npy file, or None if caching is disabled
+        """
+        if self._tile_cache_dir is None:
+            return None
+
+        fill = "fill" if fill_missing else "nofill"
+        return (
+            self._tile_cache_dir
+            / "heightmaps"
+            / f"{center_e}-{center_n}-{size_km}km-{fill}-{interpolation}.npy"
+        )
+
+    def _open_tile_zip(self, main_zip: zipfile.ZipFile, tile_zip_name: str) -> BinaryIO:
+        """
+        Open a nested tile zip for reading.
+
+        Stored (uncompressed) entries are read in place from the memory-mapped
+        main zip; compressed entries are decompressed into memory.
+
+        Args:
+            main_zip: The open main zip
+            tile_zip_name: Path of the tile zip within the main zip
+
+        Returns:
+            Seekable binary file object containing the tile zip
+        """
+        info = main_zip.getinfo(tile_zip_name)
+
+        if self._mapped is not None and info.compress_type == zipfile.ZIP_STORED:
+            offset = info.header_offset
+            if self._mapped[offset : offset + 4] == _LOCAL_HEADER_SIGNATURE:
+                # The local header's name/extra fields may differ from the central directory's
+                name_length, extra_length = struct.unpack_from("<HH", self._mapped, offset + 26)
+                data_offset = offset + _LOCAL_HEADER_SIZE + name_length + extra_length
+                return _MappedSlice(self._mapped, data_offset, info.compress_size)
+
+        with main_zip.open(info) as tile_zip_file:
+            return io.BytesIO(tile_zip_file.read())
 
     def _create_placeholder_tile(
         self, tile_name: str, interpolate: bool = False
@@ -87,7 +519,8 @@ class HeightmapGenerator:
             interpolate: If True, use marker value for interpolation; if False, use zeros
 
         Returns:
-            Tuple of (header, data) with zeros or interpolation marker
+            Tuple of (header, data) with zeros or interpolation marker; the data
+            is shared between placeholders and read-only
         """
         from .grid_reference import get_tile_corner
 
@@ -100,13 +533,12 @@ class HeightmapGenerator:
             xllcorner=xllcorner,
             yllcorner=yllcorner,
             cellsize=50,
-            nodata_value=-9999,
+            nodata_value=NODATA_VALUE,
         )
 
-        # Create placeholder data
         # Use -9998 as marker for "needs interpolation" to distinguish from NODATA (-9999)
-        fill_value = -9998.0 if interpolate else 0.0
-        data = np.full((200, 200), fill_value, dtype=np.float32)
+        fill_value = INTERPOLATION_MARKER if interpolate else 0.0
+        data = _placeholder_data(header.nrows, header.ncols, fill_value)
 
         return header, data
 
@@ -118,52 +550,96 @@ class HeightmapGenerator:
         """
         Interpolate missing data regions using boundary pixels from neighboring tiles.
 
+        Nearest-neighbour filling uses a distance transform over the whole map.
+        Linear and cubic interpolation fill each connected hole separately, from
+        the valid cells within a narrow band around it; the band is widened for
+        holes it cannot fill, e.g. ones bordered by a wide strip of NODATA.
+
         Args:
             heightmap: Array with -9998 values marking regions needing interpolation
             method: Interpolation method ('nearest', 'linear', or 'cubic')
 
         Returns:
-            Heightmap with interpolated values
+            Heightmap with interpolated values (a new array if any were filled)
         """
         # Identify pixels needing interpolation (-9998) vs valid data
-        needs_interp = heightmap == -9998.0
-        is_nodata = heightmap == -9999.0
+        needs_interp = heightmap == INTERPOLATION_MARKER
+        is_nodata = heightmap == NODATA_VALUE
         has_valid_data = ~needs_interp & ~is_nodata
 
         # If nothing needs interpolation, return as-is
         if not np.any(needs_interp):
             return heightmap
 
+        # The input may be a view of a cached tile, so never fill it in place
+        heightmap = heightmap.copy()
+
         # If no valid data exists, cannot interpolate
         if not np.any(has_valid_data):
             # Fill with zeros as fallback
             heightmap[needs_interp] = 0.0
             return heightmap
 
-        # Get coordinates and values of valid data points
-        rows, cols = np.where(has_valid_data)
-        values = heightmap[has_valid_data]
-
-        # Get coordinates of points needing interpolation
-        interp_rows, interp_cols = np.where(needs_interp)
-        interp_points = np.column_stack([interp_rows, interp_cols])
+        from scipy import ndimage
 
-        # Perform interpolation
-        try:
-            interpolated_values = griddata(
-                points=np.column_stack([rows, cols]),
-                values=values,
-                xi=interp_points,
-                method=method,
-                fill_value=0.0,  # Fallback for points outside convex hull
+        if method == "nearest":
+            # Index of the nearest valid cell for every cell, in one C pass
+            nearest = ndimage.distance_transform_edt(
+                ~has_valid_data, return_distances=False, return_indices=True
             )
+            heightmap[needs_interp] = heightmap[nearest[0][needs_interp], nearest[1][needs_interp]]
+            return heightmap
 
-            # Fill in the interpolated values
-            heightmap[needs_interp] = interpolated_values
+        # Interpolate each hole from the valid cells in a narrow band around it,
+        # rather than triangulating every valid cell in the heightmap
+        from scipy.interpolate import griddata
+        from scipy.spatial import ConvexHull, QhullError
 
-        except Exception:
-            # If interpolation fails, fill with zeros
+        # Hole cells inside the convex hull of all valid data are the ones a
+        # griddata over the whole heightmap would fill; the hull of a region is
+        # the hull of its edge cells, so only those are triangulated
+        edge = has_valid_data & ~ndimage.binary_erosion(has_valid_data)
+        try:
+            hull = ConvexHull(np.argwhere(edge))
+        except (QhullError, ValueError):
+            # Valid cells are too few or collinear to interpolate between
             heightmap[needs_interp] = 0.0
+            return heightmap
+
+        labels, _ = ndimage.label(needs_interp)
+        for label, bounds in enumerate(ndimage.find_objects(labels), start=1):
+            band = _INTERPOLATION_BAND
+            while True:
+                window = tuple(slice(max(s.start - band, 0), s.stop + band) for s in bounds)
+                hole = labels[window] == label
+                sources = has_valid_data[window] & ndimage.maximum_filter(hole, size=2 * band + 1)
+                targets = np.argwhere(hole)
+                covers_map = all(
+                    w.start == 0 and w.stop >= n for w, n in zip(window, heightmap.shape)
+                )
+
+                try:
+                    values = griddata(
+                        points=np.argwhere(sources),
+                        values=heightmap[window][sources],
+                        xi=targets,
+                        method=method,
+                        fill_value=np.nan,
+                    )
+                except (QhullError, ValueError):
+                    # Too few sources in the band to triangulate
+                    values = np.full(len(targets), np.nan)
+
+                # Widen the band until it fills every cell the whole map would,
+                # e.g. when the hole is bordered by a wide strip of NODATA
+                unfilled = targets[np.isnan(values)] + [w.start for w in window]
+                distances = unfilled @ hull.equations[:, :2].T + hull.equations[:, 2]
+                if covers_map or not np.any(np.all(distances < -1e-6, axis=1)):
+                    break
+                band *= 2
+
+            # Cells outside the hull of the valid data are filled with zeros
+            heightmap[window][hole] = np.nan_to_num(values, nan=0.0)
 
         return heightmap
 
@@ -175,6 +651,7 @@ class HeightmapGenerator:
         bit_depth: int = 8,
         fill_missing: bool = True,
         interpolation: Literal["none", "nearest", "linear", "cubic"] = "linear",
+        compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
     ) -> tuple[str, int, int]:
         """
         Generate a square heightmap from a grid reference.
@@ -187,6 +664,8 @@ class HeightmapGenerator:
             fill_missing: If True, fill missing tiles with placeholders
             interpolation: Interpolation method for missing tiles
                           ('none' for zeros, 'nearest', 'linear', 'cubic')
+            compress_level: zlib compression level for the PNG, from 0 (none) to 9
+                            (smallest); low levels write much faster
 
         Returns:
             Tuple of (output_path, width, height)
@@ -201,34 +680,37 @@ class HeightmapGenerator:
         if interpolation not in ["none", "nearest", "linear", "cubic"]:
             raise ValueError("interpolation must be one of: none, nearest, linear, cubic")
 
+        if not 0 <= compress_level <= 9:
+            raise ValueError("compress_level must be between 0 and 9")
+
         # Parse grid reference
         center_e, center_n, precision = parse_grid_reference(grid_ref)
 
         # Get required tiles
-        tiles = get_tiles_for_area(center_e, center_n, size_km)
+        tiles = get_tiles_for_grid_ref(grid_ref, size_km)
         if not tiles:
             raise ValueError(f"No tiles found for grid reference {grid_ref}")
 
-        # Load all tiles
-        # Use interpolation marker if interpolation is enabled (not 'none')
-        use_interpolation = interpolation != "none"
-        tile_data = {}
-        for tile_name in tiles:
-            data = self._load_tile(
-                tile_name, fill_missing=fill_missing, interpolate=use_interpolation
+        # Reuse a previously stitched heightmap for the same area and options
+        cache_path = self._heightmap_cache_path(
+            center_e, center_n, size_km, fill_missing, interpolation
+        )
+        heightmap = None
+        if cache_path is not None:
+            try:
+                heightmap = np.load(cache_path, mmap_mode="r")
+            except (OSError, ValueError):
+                pass
+
+        if heightmap is None:
+            heightmap = self._build_heightmap(
+                grid_ref, tiles, center_e, center_n, size_km, fill_missing, interpolation
             )
-            if data:
-                tile_data[tile_name] = data
-
-        if not tile_data:
-            raise FileNotFoundError(f"No terrain data found for area {grid_ref}")
-
-        # Stitch tiles together
-        heightmap = self._stitch_tiles(tile_data, center_e, center_n, size_km)
-
-        # Interpolate missing data if requested
-        if use_interpolation:
-            heightmap = self._interpolate_missing_data(heightmap, method=interpolation)
+            if cache_path is not None:
+                try:
+                    _save_npy_atomic(cache_path, heightmap)
+                except OSError:
+                    pass
 
         # Normalise to output bit depth
         heightmap = self._normalise_heightmap(heightmap, bit_depth)
@@ -240,16 +722,74 @@ class HeightmapGenerator:
         # Ensure the heightmaps directory exists
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-        # Save as PNG
-        if bit_depth == 8:
-            img = Image.fromarray(heightmap.astype(np.uint8), mode="L")
-        else:
-            img = Image.fromarray(heightmap.astype(np.uint16), mode="I;16")
+        # Save as PNG; Pillow is imported here so commands that never write an image skip it
+        from PIL import Image
+
+        # Hand the pixel buffer to Pillow directly; I;16 is little-endian 16-bit grayscale
+        mode, dtype = ("L", np.uint8) if bit_depth == 8 else ("I;16", np.dtype("<u2"))
+        pixels = np.ascontiguousarray(heightmap, dtype=dtype)
+        height, width = pixels.shape
+        img = Image.frombuffer(mode, (width, height), pixels, "raw", mode, 0, 1)
 
-        img.save(output_path)
+        img.save(output_path, compress_level=compress_level)
 
         return output_path, heightmap.shape[1], heightmap.shape[0]
 
+    def _build_heightmap(
+        self,
+        grid_ref: str,
+        tiles: tuple[str, ...],
+        center_e: int,
+        center_n: int,
+        size_km: int,
+        fill_missing: bool,
+        interpolation: str,
+    ) -> np.ndarray:
+        """
+        Load, stitch and interpolate the tiles for an area.
+
+        Args:
+            grid_ref: UK grid reference, used in error messages
+            tiles: Names of the tiles covering the area
+            center_e: Center easting in meters
+            center_n: Center northing in meters
+            size_km: Size of the area in kilometers
+            fill_missing: If True, fill missing tiles with placeholders
+            interpolation: Interpolation method for missing tiles
+
+        Returns:
+            Heightmap array in meters, with NODATA_VALUE where there is no data
+
+        Raises:
+            FileNotFoundError: If none of the tiles are found
+        """
+        # Load all tiles concurrently; zlib decompression releases the GIL
+        # Use interpolation marker if interpolation is enabled (not 'none')
+        use_interpolation = interpolation != "none"
+        load_tile = partial(
+            self._load_tile, fill_missing=fill_missing, interpolate=use_interpolation
+        )
+        workers = min(self.max_workers or _DEFAULT_LOAD_WORKERS, len(tiles))
+        if workers == 1:
+            # Not worth starting a thread pool for a single worker
+            loaded = list(map(load_tile, tiles))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                loaded = list(executor.map(load_tile, tiles))
+        tile_data = {tile_name: data for tile_name, data in zip(tiles, loaded) if data}
+
+        if not tile_data:
+            raise FileNotFoundError(f"No terrain data found for area {grid_ref}")
+
+        # Stitch tiles together
+        heightmap = self._stitch_tiles(tile_data, center_e, center_n, size_km)
+
+        # Interpolate missing data if requested
+        if use_interpolation:
+            heightmap = self._interpolate_missing_data(heightmap, method=interpolation)
+
+        return heightmap
+
     def _stitch_tiles(
         self,
         tile_data: dict[str, tuple[ASCHeader, np.ndarray]],
@@ -260,6 +800,10 @@ class HeightmapGenerator:
         """
         Stitch multiple tiles together and extract the requested area.
 
+        Only the requested window is allocated; each tile copies just the part
+        that overlaps it. Areas not covered by any tile are left as NODATA.
+        When one tile covers the whole window, a view of that tile is returned.
+
         Args:
             tile_data: Dictionary of tile_name -> (header, data)
             center_e: Center easting in meters
@@ -267,54 +811,33 @@ class HeightmapGenerator:
             size_km: Size of output area in kilometers
 
         Returns:
-            Combined heightmap array
+            Combined heightmap array (treat as read-only, it may be a tile view)
         """
         if not tile_data:
             raise ValueError("No tile data provided")
 
-        # Determine the bounds of all tiles
-        min_e = float("inf")
-        max_e = float("-inf")
-        min_n = float("inf")
-        max_n = float("-inf")
-        cellsize = None
-
-        for header, _ in tile_data.values():
-            if cellsize is None:
-                cellsize = header.cellsize
-            min_e = min(min_e, header.xllcorner)
-            max_e = max(max_e, header.xllcorner + header.ncols * header.cellsize)
-            min_n = min(min_n, header.yllcorner)
-            max_n = max(max_n, header.yllcorner + header.nrows * header.cellsize)
-
-        # Create a combined array
-        combined_width = int((max_e - min_e) / cellsize)
-        combined_height = int((max_n - min_n) / cellsize)
-        combined = np.full((combined_height, combined_width), -9999.0, dtype=np.float32)
-
-        # Place each tile in the combined array
-        for header, data in tile_data.values():
-            x_offset = int((header.xllcorner - min_e) / cellsize)
-            y_offset = int((max_n - (header.yllcorner + header.nrows * cellsize)) / cellsize)
-            combined[y_offset : y_offset + header.nrows, x_offset : x_offset + header.ncols] = data
-
-        # Extract the requested area
-        size_m = size_km * 1000
-        half_size = size_m / 2
-
-        # Calculate pixel coordinates for the requested area
-        left = int((center_e - half_size - min_e) / cellsize)
-        right = int((center_e + half_size - min_e) / cellsize)
-        bottom = int((max_n - (center_n - half_size)) / cellsize)
-        top = int((max_n - (center_n + half_size)) / cellsize)
-
-        # Ensure bounds are within the combined array
-        left = max(0, left)
-        right = min(combined_width, right)
-        top = max(0, top)
-        bottom = min(combined_height, bottom)
-
-        extracted = combined[top:bottom, left:right]
+        tiles = _TileSet.from_tile_data(tile_data)
+        cellsize = tiles.cellsize
+        half_size = size_km * 1000 / 2
+
+        # Requested window in whole cells of the tile grid. Rows count
+        # southwards from the top of the map, so northings are negated.
+        left = math.floor((center_e - half_size) / cellsize)
+        right = math.floor((center_e + half_size) / cellsize)
+        top = math.floor(-(center_n + half_size) / cellsize)
+        bottom = math.floor(-(center_n - half_size) / cellsize)
+
+        # A single tile covering the whole window is returned as a view, without copying
+        blits = _plan_blits(tiles, left, top, right, bottom).tolist()
+        for i, _, _, src_r, src_c, h, w in blits:
+            if h == bottom - top and w == right - left:
+                return tiles.data[i][src_r : src_r + h, src_c : src_c + w]
+
+        extracted = np.full((bottom - top, right - left), NODATA_VALUE, dtype=np.float32)
+        for i, dst_r, dst_c, src_r, src_c, h, w in blits:
+            extracted[dst_r : dst_r + h, dst_c : dst_c + w] = tiles.data[i][
+                src_r : src_r + h, src_c : src_c + w
+            ]
 
         return extracted
 
@@ -329,29 +852,61 @@ class HeightmapGenerator:
         Returns:
             normalised array
         """
-        # Mask NODATA values
-        valid_mask = heightmap != -9999.0
-        valid_data = heightmap[valid_mask]
-
-        if len(valid_data) == 0:
-            # All NODATA, return zeros
-            return np.zeros_like(heightmap)
-
-        # Get min/max of valid data
-        min_height = valid_data.min()
-        max_height = valid_data.max()
-
-        # Normalise to 0-1
-        if max_height > min_height:
-            normalised = (heightmap - min_height) / (max_height - min_height)
-        else:
-            normalised = np.zeros_like(heightmap)
-
-        # Set NODATA to 0
-        normalised[~valid_mask] = 0.0
-
-        # Scale to bit depth
         if bit_depth == 8:
-            return (normalised * 255).astype(np.uint8)
+            dtype, max_value = np.uint8, 255
         else:
-            return (normalised * 65535).astype(np.uint16)
+            dtype, max_value = np.uint16, 65535
+
+        # Work in blocks of rows so the float temporary and mask stay small and
+        # cache-resident, and the input (possibly a read-only tile view) is never modified
+        rows_per_block = max(1, _NORMALISE_BLOCK_CELLS // max(heightmap.shape[1], 1))
+        blocks = [
+            slice(start, start + rows_per_block)
+            for start in range(0, heightmap.shape[0], rows_per_block)
+        ]
+
+        # Min/max of valid data without copying it out of the array. A plain min is
+        # tried first: a block whose minimum is above NODATA has no NODATA cells and
+        # needs no mask in either pass.
+        min_height = max_height = None
+        masked_blocks = []
+        for rows in blocks:
+            block = heightmap[rows]
+            block_min = block.min(initial=np.inf)
+            masked = not block_min > NODATA_VALUE
+            if masked:
+                valid = block != NODATA_VALUE
+                block_min = block.min(where=valid, initial=np.inf)
+                block_max = block.max(where=valid, initial=-np.inf)
+            else:
+                block_max = block.max(initial=-np.inf)
+            masked_blocks.append(masked)
+            min_height = block_min if min_height is None else min(min_height, block_min)
+            max_height = block_max if max_height is None else max(max_height, block_max)
+
+        if min_height is None or max_height <= min_height:
+            # All NODATA or uniform, return zeros without scaling anything
+            return np.zeros(heightmap.shape, dtype=dtype)
+
+        # Normalise each block to 0-1 in one reused float buffer, then scale straight
+        # into the integer output; NODATA cells keep their zero
+        height_range = max_height - min_height
+        output = np.zeros(heightmap.shape, dtype=dtype)
+        buffer = np.empty(
+            (min(rows_per_block, heightmap.shape[0]), heightmap.shape[1]),
+            dtype=np.result_type(heightmap, min_height),
+        )
+        for rows, masked in zip(blocks, masked_blocks):
+            block = heightmap[rows]
+            normalised = buffer[: block.shape[0]]
+            np.subtract(block, min_height, out=normalised)
+            normalised /= height_range
+            np.multiply(
+                normalised,
+                max_value,
+                out=output[rows],
+                where=block != NODATA_VALUE if masked else True,
+                casting="unsafe",
+            )
+
+        return output
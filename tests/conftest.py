@@ -1,6 +1,8 @@
 """Shared pytest fixtures for OSHeightsmith tests."""
 
 import io
+import zipfile
+from pathlib import Path
 from typing import BinaryIO
 
 import numpy as np
@@ -80,3 +82,25 @@ def mock_tile_data():
         "st17": (header1, data1),
         "st27": (header2, data2),
     }
+
+
+def _write_tile_zip(main_zip: zipfile.ZipFile, tile_name: str, content: str, compression: int):
+    """Write a nested OS Terrain 50 tile zip into the main zip."""
+    grid_square = tile_name[:2]
+    stem = f"{tile_name}_OST50GRID_20250529"
+
+    tile_zip_data = io.BytesIO()
+    with zipfile.ZipFile(tile_zip_data, "w", compression=compression) as tile_zip:
+        tile_zip.writestr(f"{stem}.asc", content)
+
+    main_zip.writestr(f"data/{grid_square}/{stem}.zip", tile_zip_data.getvalue())
+
+
+@pytest.fixture(params=[zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED], ids=["deflated", "stored"])
+def terrain_zip_path(request, tmp_path, sample_asc_content) -> Path:
+    """OS Terrain 50 style zip containing a single nested tile (st17)."""
+    zip_path = tmp_path / "terr50_gagg_gb.zip"
+    with zipfile.ZipFile(zip_path, "w", compression=request.param) as main_zip:
+        main_zip.writestr("data/readme.txt", "OS Terrain 50")
+        _write_tile_zip(main_zip, "st17", sample_asc_content, request.param)
+    return zip_path
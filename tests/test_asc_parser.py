@@ -1,11 +1,18 @@
 """Tests for ESRI ASCII Grid file parsing."""
 
+import dataclasses
 import io
 
 import numpy as np
 import pytest
 
-from src.osheightsmith.asc_parser import ASCHeader, parse_asc_file
+from src.osheightsmith import asc_parser
+from src.osheightsmith.asc_parser import (
+    ASCHeader,
+    clear_asc_cache,
+    parse_asc_file,
+    sniff_asc,
+)
 
 
 class TestASCHeader:
@@ -30,6 +37,16 @@ class TestASCHeader:
         header = ASCHeader(ncols=100, nrows=100, xllcorner=0, yllcorner=0, cellsize=10)
         assert header.nodata_value == -9999.0
 
+    def test_header_is_frozen(self):
+        """Test that headers are immutable and hashable."""
+        header = ASCHeader(ncols=100, nrows=100, xllcorner=0, yllcorner=0, cellsize=10)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            header.ncols = 50
+        assert hash(header) == hash(
+            ASCHeader(ncols=100, nrows=100, xllcorner=0, yllcorner=0, cellsize=10)
+        )
+
 
 class TestParseASCFile:
     """Test ASC file parsing."""
@@ -48,6 +65,83 @@ class TestParseASCFile:
         assert data.shape == (200, 200)
         assert data.dtype == np.float32
 
+    def test_parse_with_expected_header(self, sample_asc_content):
+        """Test that a known header skips header parsing but still reads the data."""
+        expected = ASCHeader(ncols=200, nrows=200, xllcorner=310000, yllcorner=170000, cellsize=50)
+        file_obj = io.BytesIO(sample_asc_content.encode("utf-8"))
+        header, data = parse_asc_file(file_obj, expected=expected)
+
+        _, parsed = parse_asc_file(io.BytesIO(sample_asc_content.encode("utf-8")))
+
+        assert header is expected
+        np.testing.assert_array_equal(data, parsed)
+
+    def test_parse_with_expected_header_count_mismatch(self, sample_asc_content):
+        """Test that a known header with the wrong dimensions raises ValueError."""
+        expected = ASCHeader(ncols=100, nrows=100, xllcorner=0, yllcorner=0, cellsize=50)
+        file_obj = io.BytesIO(sample_asc_content.encode("utf-8"))
+
+        with pytest.raises(ValueError, match="Data count mismatch"):
+            parse_asc_file(file_obj, expected=expected)
+
+    def test_parse_from_path(self, sample_asc_content, tmp_path):
+        """Test parsing an ASC file given by path."""
+        asc_path = tmp_path / "st17.asc"
+        asc_path.write_text(sample_asc_content)
+
+        header, data = parse_asc_file(asc_path)
+        _, expected = parse_asc_file(io.BytesIO(sample_asc_content.encode("utf-8")))
+
+        assert header.ncols == 200
+        np.testing.assert_array_equal(data, expected)
+
+    def test_parse_from_path_cached(self, sample_asc_content, tmp_path):
+        """Test that an unchanged file is parsed once and a changed one again."""
+        clear_asc_cache()
+        asc_path = tmp_path / "st17.asc"
+        asc_path.write_text(sample_asc_content)
+
+        header1, data1 = parse_asc_file(asc_path)
+        header2, data2 = parse_asc_file(str(asc_path))
+
+        assert data2 is data1
+        assert not data1.flags.writeable
+
+        asc_path.write_text(sample_asc_content.replace("cellsize 50", "cellsize 25.0"))
+        header3, data3 = parse_asc_file(asc_path)
+
+        assert data3 is not data1
+        assert header3.cellsize == 25
+        clear_asc_cache()
+
+    def test_parse_from_path_cache_evicts_least_recently_used(
+        self, sample_asc_content, tmp_path, monkeypatch
+    ):
+        """Test that the path cache drops the least recently used file when full."""
+        clear_asc_cache()
+        monkeypatch.setattr(asc_parser, "_ASC_CACHE_MAXSIZE", 2)
+        paths = [tmp_path / f"st{i}7.asc" for i in range(3)]
+        for path in paths:
+            path.write_text(sample_asc_content)
+
+        _, data0 = parse_asc_file(paths[0])
+        _, data1 = parse_asc_file(paths[1])
+        parse_asc_file(paths[0])  # Most recently used again, so paths[1] is evicted next
+        parse_asc_file(paths[2])
+
+        assert len(asc_parser._ASC_CACHE) == 2
+        assert parse_asc_file(paths[0])[1] is data0
+        assert parse_asc_file(paths[1])[1] is not data1
+        clear_asc_cache()
+
+    def test_parse_empty_file_from_path(self, tmp_path):
+        """Test that an empty file given by path raises ValueError."""
+        asc_path = tmp_path / "empty.asc"
+        asc_path.write_bytes(b"")
+
+        with pytest.raises(ValueError, match="No data found in ASC file"):
+            parse_asc_file(str(asc_path))
+
     def test_parse_with_xllcenter(self, sample_asc_xllcenter_content):
         """Test parsing ASC file with xllcenter/yllcenter instead of corner."""
         file_obj = io.BytesIO(sample_asc_xllcenter_content.encode("utf-8"))
@@ -241,3 +335,58 @@ NODATA_VALUE -9999
         assert header.ncols == 5
         assert header.nrows == 5
         assert header.nodata_value == -9999
+
+    def test_invalid_data_value(self):
+        """Test that a non-numeric data value raises ValueError."""
+        content = """ncols 2
+nrows 2
+xllcorner 0
+yllcorner 0
+cellsize 1
+1 2
+3 abc
+"""
+        file_obj = io.BytesIO(content.encode("utf-8"))
+        with pytest.raises(ValueError):
+            parse_asc_file(file_obj)
+
+    def test_parse_wrapped_rows(self):
+        """Test parsing data rows that are wrapped over several lines."""
+        content = """ncols 4
+nrows 2
+xllcorner 0.0
+yllcorner 0.0
+cellsize 50.0
+1.0 2.0
+3.0 4.0 5.0
+6.0 7.0 8.0
+"""
+        file_obj = io.BytesIO(content.encode("utf-8"))
+        header, data = parse_asc_file(file_obj)
+
+        assert data.shape == (2, 4)
+        np.testing.assert_array_equal(data, [[1.0, 2.0, 3.0, 4.0], [5.0, 6.0, 7.0, 8.0]])
+
+
+class TestSniffASC:
+    """Test the quick ASC format check."""
+
+    def test_sniff_valid_header(self, sample_asc_content):
+        """Test that ASC content is recognised, in any header case."""
+        assert sniff_asc(sample_asc_content.encode("utf-8"))
+        assert sniff_asc(b"\n  NCOLS 10\nNROWS 10\n")
+        assert sniff_asc(b"xllcenter -25.0\n")
+
+    def test_sniff_rejects_other_content(self):
+        """Test that non-ASC content is rejected."""
+        assert not sniff_asc(b"")
+        assert not sniff_asc(b"<html>Not found</html>")
+        assert not sniff_asc(b"ncols ten\n")
+        assert not sniff_asc(b"PK\x03\x04ncols 10")
+
+    def test_sniff_max_read_length(self):
+        """Test that only the first max_read_length bytes are examined."""
+        buf = b" " * 600 + b"ncols 10\n"
+
+        assert not sniff_asc(buf)
+        assert sniff_asc(buf, max_read_length=700)
@@ -5,6 +5,7 @@ from unittest.mock import patch
 from typer.testing import CliRunner
 
 from src.osheightsmith.cli import app
+from src.osheightsmith.defaults import DEFAULT_PNG_COMPRESS_LEVEL
 
 runner = CliRunner()
 
@@ -64,6 +65,7 @@ class TestGenerateCommand:
             bit_depth=16,
             fill_missing=True,
             interpolation="linear",
+            compress_level=DEFAULT_PNG_COMPRESS_LEVEL,
         )
 
     @patch("src.osheightsmith.cli.HeightmapGenerator")
@@ -89,6 +91,7 @@ class TestGenerateCommand:
             bit_depth=8,
             fill_missing=True,
             interpolation="linear",
+            compress_level=DEFAULT_PNG_COMPRESS_LEVEL,
         )
 
     def test_generate_invalid_bit_depth(self, tmp_path):
@@ -174,6 +177,82 @@ class TestGenerateCommand:
         call_kwargs = mock_generator.generate_heightmap.call_args.kwargs
         assert call_kwargs["fill_missing"] is False
 
+    @patch("src.osheightsmith.cli.HeightmapGenerator")
+    def test_generate_with_no_cache(self, mock_generator_class, tmp_path):
+        """Test generate command with --no-cache flag."""
+        mock_generator = mock_generator_class.return_value
+        output_path = str(tmp_path / "output.png")
+        mock_generator.generate_heightmap.return_value = (output_path, 200, 200)
+
+        zip_path = tmp_path / "test.zip"
+        zip_path.touch()
+
+        result = runner.invoke(
+            app, ["generate", "ST1876", "--zip-path", str(zip_path), "--no-cache"]
+        )
+
+        assert result.exit_code == 0
+        mock_generator_class.assert_called_once_with(
+            str(zip_path), cache_dir=None, max_workers=None
+        )
+
+    @patch("src.osheightsmith.cli.HeightmapGenerator")
+    def test_generate_with_workers(self, mock_generator_class, tmp_path):
+        """Test generate command with --workers option."""
+        mock_generator = mock_generator_class.return_value
+        output_path = str(tmp_path / "output.png")
+        mock_generator.generate_heightmap.return_value = (output_path, 200, 200)
+
+        zip_path = tmp_path / "test.zip"
+        zip_path.touch()
+
+        result = runner.invoke(
+            app, ["generate", "ST1876", "--zip-path", str(zip_path), "--workers", "2"]
+        )
+
+        assert result.exit_code == 0
+        assert mock_generator_class.call_args.kwargs["max_workers"] == 2
+
+    @patch("src.osheightsmith.cli.HeightmapGenerator")
+    def test_generate_with_compress_level(self, mock_generator_class, tmp_path):
+        """Test generate command with --compress-level option."""
+        mock_generator = mock_generator_class.return_value
+        output_path = str(tmp_path / "output.png")
+        mock_generator.generate_heightmap.return_value = (output_path, 200, 200)
+
+        zip_path = tmp_path / "test.zip"
+        zip_path.touch()
+
+        result = runner.invoke(
+            app, ["generate", "ST1876", "--zip-path", str(zip_path), "--compress-level", "9"]
+        )
+
+        assert result.exit_code == 0
+        call_kwargs = mock_generator.generate_heightmap.call_args.kwargs
+        assert call_kwargs["compress_level"] == 9
+
+    def test_generate_default_compress_level_matches_library(self):
+        """Test that the CLI defaults to the generator's compression level."""
+        import inspect
+
+        from src.osheightsmith.cli import generate
+        from src.osheightsmith.heightmap import HeightmapGenerator
+
+        parameters = inspect.signature(HeightmapGenerator.generate_heightmap).parameters
+        cli_option = inspect.signature(generate).parameters["compress_level"].default
+        assert cli_option.default == parameters["compress_level"].default
+
+    def test_generate_invalid_compress_level(self, tmp_path):
+        """Test generate command with an out-of-range compression level."""
+        zip_path = tmp_path / "test.zip"
+        zip_path.touch()
+
+        result = runner.invoke(
+            app, ["generate", "ST1876", "--zip-path", str(zip_path), "--compress-level", "10"]
+        )
+
+        assert result.exit_code != 0
+
     @patch("src.osheightsmith.cli.HeightmapGenerator")
     def test_generate_with_interpolation_cubic(self, mock_generator_class, tmp_path):
         """Test generate command with cubic interpolation."""
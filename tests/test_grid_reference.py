@@ -7,6 +7,7 @@ from src.osheightsmith.grid_reference import (
     get_tile_corner,
     get_tile_name,
     get_tiles_for_area,
+    get_tiles_for_grid_ref,
     parse_grid_reference,
 )
 
@@ -34,6 +35,15 @@ class TestParseGridReference:
         assert easting == 318_000
         assert northing == 176_000
 
+    def test_parse_unicode_digits(self):
+        """Test that non-ASCII decimal digits are accepted, as int() accepts them."""
+        assert parse_grid_reference("ST\uff11\uff12") == (310_000, 120_000, 10_000)
+
+    def test_invalid_format_superscript_digits(self):
+        """Test that digit-like characters that are not decimal digits are rejected."""
+        with pytest.raises(ValueError, match="Invalid grid reference format"):
+            parse_grid_reference("ST\u00b23")
+
     def test_parse_high_precision(self):
         """Test parsing 10-digit grid reference (1m precision)."""
         easting, northing, precision = parse_grid_reference("ST1234567890")
@@ -192,6 +202,27 @@ class TestGetTilesForArea:
         assert tiles == sorted(tiles)
 
 
+class TestGetTilesForGridRef:
+    """Test tile calculation from a grid reference."""
+
+    def test_matches_area_calculation(self):
+        """Test that tiles match those for the parsed center coordinates."""
+        tiles = get_tiles_for_grid_ref("ST1575", 10)
+        assert tiles == tuple(get_tiles_for_area(315_000, 175_000, 10))
+
+    def test_cached_tuple(self):
+        """Test that repeated lookups return the same hashable tuple."""
+        tiles = get_tiles_for_grid_ref("ST1876", 20)
+        assert isinstance(tiles, tuple)
+        assert get_tiles_for_grid_ref("ST1876", 20) is tiles
+        assert hash(tiles) == hash(tuple(tiles))
+
+    def test_invalid_grid_ref(self):
+        """Test that an invalid grid reference raises ValueError."""
+        with pytest.raises(ValueError, match="Invalid grid reference format"):
+            get_tiles_for_grid_ref("12ST", 10)
+
+
 class TestGridSquares:
     """Test GRID_SQUARES constant."""
 
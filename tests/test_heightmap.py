@@ -1,5 +1,8 @@
 """Tests for heightmap generation and stitching."""
 
+import io
+import os
+import zipfile
 from pathlib import Path
 from unittest.mock import patch
 
@@ -8,7 +11,7 @@ import pytest
 from PIL import Image
 
 from src.osheightsmith.asc_parser import ASCHeader
-from src.osheightsmith.heightmap import HeightmapGenerator
+from src.osheightsmith.heightmap import HeightmapGenerator, _default_cache_dir
 
 
 class TestHeightmapGenerator:
@@ -27,6 +30,165 @@ class TestHeightmapGenerator:
         with pytest.raises(FileNotFoundError, match="Terrain data not found"):
             HeightmapGenerator("nonexistent.zip")
 
+    def test_init_with_invalid_max_workers(self, tmp_path):
+        """Test initialization with a worker count below one."""
+        zip_path = tmp_path / "test.zip"
+        zip_path.touch()
+
+        with pytest.raises(ValueError, match="max_workers must be at least 1"):
+            HeightmapGenerator(str(zip_path), max_workers=0)
+
+
+class TestDefaultCacheDir:
+    """Test resolution of the default cache directory."""
+
+    def test_uses_xdg_cache_home(self, monkeypatch, tmp_path):
+        """Test that an absolute XDG_CACHE_HOME is used."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert _default_cache_dir() == tmp_path / "osheightsmith"
+
+    @pytest.mark.parametrize("value", [None, "", "relative/cache"])
+    def test_falls_back_to_home_cache(self, monkeypatch, value):
+        """Test that an unset, empty or relative XDG_CACHE_HOME is ignored."""
+        if value is None:
+            monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+        else:
+            monkeypatch.setenv("XDG_CACHE_HOME", value)
+        assert _default_cache_dir() == Path("~/.cache/osheightsmith").expanduser()
+
+
+class TestLoadTile:
+    """Test loading tiles from the nested zip structure."""
+
+    def test_load_existing_tile(self, terrain_zip_path):
+        """Test loading a tile present in the zip."""
+        with HeightmapGenerator(str(terrain_zip_path)) as generator:
+            header, data = generator._load_tile("st17")
+
+        assert header.xllcorner == 310000
+        assert header.yllcorner == 170000
+        assert data.shape == (200, 200)
+        assert data[0, 0] == pytest.approx(10.5)
+
+    def test_load_missing_tile(self, terrain_zip_path):
+        """Test that a missing tile returns None unless filling is requested."""
+        with HeightmapGenerator(str(terrain_zip_path)) as generator:
+            assert generator._load_tile("st28") is None
+
+            header, data = generator._load_tile("st28", fill_missing=True)
+
+        assert header.xllcorner == 320000
+        assert header.yllcorner == 180000
+        assert np.all(data == 0.0)
+
+    def test_placeholder_tiles_share_read_only_data(self, terrain_zip_path):
+        """Test that placeholder tiles reuse one read-only array per fill value."""
+        with HeightmapGenerator(str(terrain_zip_path)) as generator:
+            _, zeros1 = generator._load_tile("st28", fill_missing=True)
+            _, zeros2 = generator._load_tile("st29", fill_missing=True)
+            _, markers = generator._load_tile("st28", fill_missing=True, interpolate=True)
+
+        assert zeros1 is zeros2
+        assert not zeros1.flags.writeable
+        assert np.all(markers == -9998.0)
+
+    def test_load_tile_skips_non_asc_content(self, tmp_path):
+        """Test that an .asc entry without an ASC header is treated as a missing tile."""
+        tile_zip_data = io.BytesIO()
+        with zipfile.ZipFile(tile_zip_data, "w") as tile_zip:
+            tile_zip.writestr("st17_OST50GRID_20250529.asc", "<html>Not found</html>")
+
+        zip_path = tmp_path / "terr50_gagg_gb.zip"
+        with zipfile.ZipFile(zip_path, "w") as main_zip:
+            main_zip.writestr("data/st/st17_OST50GRID_20250529.zip", tile_zip_data.getvalue())
+
+        with HeightmapGenerator(str(zip_path)) as generator:
+            assert generator._load_tile("st17") is None
+            header, data = generator._load_tile("st17", fill_missing=True)
+
+        assert header.xllcorner == 310000
+        assert np.all(data == 0.0)
+
+    def test_load_tile_reuses_open_zip(self, terrain_zip_path):
+        """Test that the main zip is opened once and parsed tiles are cached."""
+        with HeightmapGenerator(str(terrain_zip_path)) as generator:
+            with patch("src.osheightsmith.heightmap.zipfile.ZipFile", wraps=zipfile.ZipFile) as zf:
+                first = generator._load_tile("st17")
+                second = generator._load_tile("st17")
+                generator._load_tile("st28")
+
+        # One open for the main zip, one for the nested tile zip
+        assert zf.call_count == 2
+        assert first is second
+
+    def test_main_zip_shared_between_generators(self, terrain_zip_path):
+        """Test that generators over the same unchanged zip share one open archive."""
+        with HeightmapGenerator(str(terrain_zip_path)) as generator:
+            first = generator._open_main_zip()
+
+        with HeightmapGenerator(str(terrain_zip_path)) as generator:
+            assert generator._open_main_zip() is first
+
+        stat = terrain_zip_path.stat()
+        os.utime(terrain_zip_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        with HeightmapGenerator(str(terrain_zip_path)) as generator:
+            assert generator._open_main_zip() is not first
+
+    def test_load_tile_from_disk_cache(self, terrain_zip_path, tmp_path):
+        """Test that parsed tiles are cached on disk and reused by later generators."""
+        cache_dir = tmp_path / "cache"
+        with HeightmapGenerator(str(terrain_zip_path), cache_dir=cache_dir) as generator:
+            _, parsed = generator._load_tile("st17")
+
+        with HeightmapGenerator(str(terrain_zip_path), cache_dir=cache_dir) as generator:
+            with patch("src.osheightsmith.heightmap.zipfile.ZipFile") as zf:
+                header, cached = generator._load_tile("st17")
+
+        zf.assert_not_called()
+        assert header.xllcorner == 310000
+        np.testing.assert_array_equal(cached, parsed)
+
+    def test_disk_cache_invalidated_by_zip_change(self, terrain_zip_path, tmp_path):
+        """Test that changing the zip file stops old cache entries being used."""
+        cache_dir = tmp_path / "cache"
+        with HeightmapGenerator(str(terrain_zip_path), cache_dir=cache_dir) as generator:
+            generator._load_tile("st17")
+
+        stat = terrain_zip_path.stat()
+        os.utime(terrain_zip_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        with HeightmapGenerator(str(terrain_zip_path), cache_dir=cache_dir) as generator:
+            assert generator._read_cached_tile("st17") is None
+
+    def test_disk_cache_invalidated_by_cache_version(self, terrain_zip_path, tmp_path):
+        """Test that bumping the cache version stops old cache entries being used."""
+        cache_dir = tmp_path / "cache"
+        with HeightmapGenerator(str(terrain_zip_path), cache_dir=cache_dir) as generator:
+            generator._load_tile("st17")
+            assert generator._read_cached_tile("st17") is not None
+
+        with patch("src.osheightsmith.heightmap._CACHE_VERSION", 999):
+            with HeightmapGenerator(str(terrain_zip_path), cache_dir=cache_dir) as generator:
+                assert generator._read_cached_tile("st17") is None
+                cache_path = generator._heightmap_cache_path(318000, 176000, 10, True, "linear")
+
+        assert "v999" in cache_path.parts
+
+    def test_canonicalise_nodata(self):
+        """Test that a tile's own NODATA value is mapped onto the -9999 sentinel."""
+        header = ASCHeader(
+            ncols=2, nrows=2, xllcorner=0, yllcorner=0, cellsize=50, nodata_value=-32768
+        )
+        data = np.array([[1.0, -32768.0], [3.0, 4.0]], dtype=np.float32)
+
+        generator = HeightmapGenerator.__new__(HeightmapGenerator)
+        header, data = generator._canonicalise_nodata(header, data)
+
+        assert header.nodata_value == -9999.0
+        assert data[0, 1] == -9999.0
+        assert data[1, 1] == 4.0
+
 
 class TestStitchTiles:
     """Test tile stitching functionality."""
@@ -53,6 +215,27 @@ class TestStitchTiles:
         assert result.shape[0] > 0
         assert result.shape[1] > 0
 
+    def test_stitch_window_inside_one_tile(self, mock_tile_data):
+        """Test that a window inside a single tile is returned without copying."""
+        generator = HeightmapGenerator.__new__(HeightmapGenerator)
+        result = generator._stitch_tiles(mock_tile_data, 315000, 175000, 5)
+
+        _, data1 = mock_tile_data["st17"]
+        assert result.shape == (100, 100)
+        assert np.shares_memory(result, data1)
+        np.testing.assert_array_equal(result, data1[50:150, 50:150])
+
+    def test_stitch_converts_non_float32_tiles(self, mock_tile_data):
+        """Test that tiles in another dtype still stitch to float32."""
+        header, data1 = mock_tile_data["st17"]
+        tile_data = {"st17": (header, data1.astype(np.float64))}
+
+        generator = HeightmapGenerator.__new__(HeightmapGenerator)
+        result = generator._stitch_tiles(tile_data, 315000, 175000, 5)
+
+        assert result.dtype == np.float32
+        np.testing.assert_array_equal(result, data1[50:150, 50:150])
+
     def test_stitch_multiple_tiles(self):
         """Test stitching multiple tiles together."""
         # Create two tiles side by side
@@ -88,6 +271,29 @@ class TestStitchTiles:
         assert result.shape[0] > 0
         assert result.shape[1] > 0
 
+    def test_stitch_tile_placement(self, mock_tile_data):
+        """Test that stitched tiles land in the right place in the output."""
+        generator = HeightmapGenerator.__new__(HeightmapGenerator)
+        # 10km window centred on the shared edge of st17 and st27
+        result = generator._stitch_tiles(mock_tile_data, 320000, 175000, 10)
+
+        _, data1 = mock_tile_data["st17"]
+        _, data2 = mock_tile_data["st27"]
+        assert result.shape == (200, 200)
+        np.testing.assert_array_equal(result[:, :100], data1[:, 100:])
+        np.testing.assert_array_equal(result[:, 100:], data2[:, :100])
+
+    def test_stitch_window_outside_tiles(self, mock_tile_data):
+        """Test that parts of the window with no tile are NODATA, not cropped."""
+        tile_data = {"st17": mock_tile_data["st17"]}
+
+        generator = HeightmapGenerator.__new__(HeightmapGenerator)
+        result = generator._stitch_tiles(tile_data, 320000, 175000, 10)
+
+        assert result.shape == (200, 200)
+        assert np.all(result[:, 100:] == -9999.0)
+        assert not np.any(result[:, :100] == -9999.0)
+
     def test_stitch_tiles_with_nodata(self):
         """Test stitching tiles containing NODATA values."""
         header = ASCHeader(
@@ -172,6 +378,21 @@ class TestNormaliseHeightmap:
         # Should return all zeros when there's no range
         assert np.all(result == 0)
 
+    def test_normalise_in_blocks_read_only_input(self):
+        """Test that blockwise normalisation matches one block and leaves the input alone."""
+        data = np.random.rand(50, 30).astype(np.float32) * 100
+        data[10:20, 5:15] = -9999.0
+        data.setflags(write=False)
+
+        generator = HeightmapGenerator.__new__(HeightmapGenerator)
+        whole = generator._normalise_heightmap(data, 16)
+        with patch("src.osheightsmith.heightmap._NORMALISE_BLOCK_CELLS", 64):
+            blocked = generator._normalise_heightmap(data, 16)
+
+        np.testing.assert_array_equal(blocked, whole)
+        assert whole.max() == 65535
+        assert np.all(whole[10:20, 5:15] == 0)
+
 
 class TestGenerateHeightmap:
     """Test end-to-end heightmap generation."""
@@ -243,6 +464,11 @@ class TestGenerateHeightmap:
         img = Image.open(result_path)
         assert img.mode == "I;16"  # 16-bit integer mode
 
+        # Pixels keep the full 16-bit range
+        pixels = np.array(img)
+        assert pixels.dtype == np.uint16
+        assert pixels.max() == 65535
+
     @patch.object(HeightmapGenerator, "_load_tile")
     def test_generate_heightmap_auto_filename(self, mock_load_tile, tmp_path):
         """Test auto-generating output filename."""
@@ -283,6 +509,55 @@ class TestGenerateHeightmap:
         with pytest.raises(FileNotFoundError, match="No terrain data found"):
             generator.generate_heightmap("ST1876", 10, bit_depth=8)
 
+    def test_generate_heightmap_from_zip(self, terrain_zip_path, tmp_path):
+        """Test generating a heightmap end to end from a terrain zip."""
+        output_path = tmp_path / "from_zip.png"
+
+        with HeightmapGenerator(str(terrain_zip_path)) as generator:
+            result_path, width, height = generator.generate_heightmap(
+                "ST1876", 10, str(output_path), bit_depth=16, interpolation="none"
+            )
+
+        assert (width, height) == (200, 200)
+        img = Image.open(result_path)
+        assert img.size == (200, 200)
+
+    def test_generate_heightmap_single_worker(self, terrain_zip_path, tmp_path):
+        """Test generating a heightmap with tiles loaded serially."""
+        output_path = tmp_path / "serial.png"
+
+        with HeightmapGenerator(str(terrain_zip_path), max_workers=1) as generator:
+            with patch("src.osheightsmith.heightmap.ThreadPoolExecutor") as executor:
+                _, width, height = generator.generate_heightmap(
+                    "ST1876", 20, str(output_path), interpolation="none"
+                )
+
+        executor.assert_not_called()
+        assert (width, height) == (400, 400)
+
+    def test_generate_heightmap_from_cache(self, terrain_zip_path, tmp_path):
+        """Test that a repeated request reuses the cached heightmap, at any bit depth."""
+        cache_dir = tmp_path / "cache"
+
+        with HeightmapGenerator(str(terrain_zip_path), cache_dir=cache_dir) as generator:
+            generator.generate_heightmap(
+                "ST1876", 10, str(tmp_path / "first.png"), bit_depth=16, interpolation="none"
+            )
+
+        with HeightmapGenerator(str(terrain_zip_path), cache_dir=cache_dir) as generator:
+            with patch.object(generator, "_load_tile") as mock_load_tile:
+                generator.generate_heightmap(
+                    "ST 18 76", 10, str(tmp_path / "second.png"), bit_depth=16, interpolation="none"
+                )
+                generator.generate_heightmap(
+                    "ST1876", 10, str(tmp_path / "third.png"), bit_depth=8, interpolation="none"
+                )
+
+        mock_load_tile.assert_not_called()
+        first = np.array(Image.open(tmp_path / "first.png"))
+        np.testing.assert_array_equal(np.array(Image.open(tmp_path / "second.png")), first)
+        assert Image.open(tmp_path / "third.png").mode == "L"
+
     def test_invalid_bit_depth(self, tmp_path):
         """Test that invalid bit depth raises ValueError."""
         zip_path = tmp_path / "test.zip"
@@ -293,6 +568,16 @@ class TestGenerateHeightmap:
         with pytest.raises(ValueError, match="bit_depth must be 8 or 16"):
             generator.generate_heightmap("ST1876", 10, bit_depth=32)
 
+    def test_invalid_compress_level(self, tmp_path):
+        """Test that an out-of-range compression level raises ValueError."""
+        zip_path = tmp_path / "test.zip"
+        zip_path.touch()
+
+        generator = HeightmapGenerator(str(zip_path))
+
+        with pytest.raises(ValueError, match="compress_level must be between 0 and 9"):
+            generator.generate_heightmap("ST1876", 10, compress_level=10)
+
     @patch.object(HeightmapGenerator, "_load_tile")
     def test_generate_with_missing_tiles_filled(self, mock_load_tile, tmp_path):
         """Test generating heightmap with missing tiles filled with zeros."""
@@ -418,6 +703,17 @@ class TestInterpolateMissingData:
         # Should fill with zeros as fallback
         assert np.all(result == 0.0)
 
+    def test_interpolate_does_not_modify_input(self):
+        """Test that interpolation fills a copy rather than the input array."""
+        heightmap = np.array([[10.0, 20.0], [-9998.0, 30.0]], dtype=np.float32)
+        original = heightmap.copy()
+
+        generator = HeightmapGenerator.__new__(HeightmapGenerator)
+        result = generator._interpolate_missing_data(heightmap, method="nearest")
+
+        np.testing.assert_array_equal(heightmap, original)
+        assert -9998.0 not in result
+
     def test_interpolate_preserves_nodata(self):
         """Test that NODATA (-9999) is preserved during interpolation."""
         heightmap = np.array(
@@ -438,3 +734,59 @@ class TestInterpolateMissingData:
         assert result[2, 2] == -9999.0
         # Interpolation marker should be filled
         assert result[1, 0] != -9998.0
+
+    def test_interpolate_separate_holes_linear(self):
+        """Test that several holes are each filled from their own surroundings."""
+        rows, cols = np.mgrid[0:60, 0:60]
+        plane = (2.0 * rows + 3.0 * cols).astype(np.float32)
+        heightmap = plane.copy()
+        heightmap[5:15, 5:15] = -9998.0
+        heightmap[30:55, 30:55] = -9998.0
+
+        generator = HeightmapGenerator.__new__(HeightmapGenerator)
+        result = generator._interpolate_missing_data(heightmap, method="linear")
+
+        # Linear interpolation reproduces a plane exactly
+        np.testing.assert_allclose(result, plane, atol=1e-3)
+
+    def test_interpolate_hole_behind_wide_nodata_strip(self):
+        """Test that a hole with no valid cells nearby is filled from further away."""
+        heightmap = np.full((60, 60), 50.0, dtype=np.float32)
+        # Sea wider than the interpolation band on three sides of the missing tile
+        heightmap[3:57, 30:60] = -9999.0
+        heightmap[15:45, 42:60] = -9998.0
+
+        generator = HeightmapGenerator.__new__(HeightmapGenerator)
+
+        for method in ["linear", "cubic"]:
+            result = generator._interpolate_missing_data(heightmap, method=method)
+            np.testing.assert_allclose(result[15:45, 42:60], 50.0, atol=1e-3)
+
+    @pytest.mark.parametrize("method, tolerance", [("linear", 1.0), ("cubic", 0.1)])
+    def test_interpolate_close_to_full_griddata(self, method, tolerance):
+        """Test that band-limited interpolation stays close to griddata over the whole map."""
+        from scipy.interpolate import griddata
+
+        rows, cols = np.mgrid[0:120, 0:120]
+        surface = (100 * np.sin(rows / 120) + 80 * np.cos(cols / 120)).astype(np.float32)
+        heightmap = surface.copy()
+        heightmap[30:90, 30:90] = -9998.0
+        hole = heightmap == -9998.0
+
+        generator = HeightmapGenerator.__new__(HeightmapGenerator)
+        result = generator._interpolate_missing_data(heightmap, method=method)
+
+        expected = griddata(np.argwhere(~hole), heightmap[~hole], np.argwhere(hole), method=method)
+        assert np.abs(result[hole] - expected).max() < tolerance
+
+    def test_interpolate_nearest_uses_closest_valid_cell(self):
+        """Test that nearest filling copies the closest valid cell, skipping NODATA."""
+        heightmap = np.array(
+            [[1.0, -9998.0, -9998.0, -9999.0, -9999.0, 5.0]],
+            dtype=np.float32,
+        )
+
+        generator = HeightmapGenerator.__new__(HeightmapGenerator)
+        result = generator._interpolate_missing_data(heightmap, method="nearest")
+
+        np.testing.assert_array_equal(result, [[1.0, 1.0, 1.0, -9999.0, -9999.0, 5.0]])